@@ -1,33 +1,46 @@
 #!/usr/bin/env python3
 """
 Dark Volume OSD with Themes (PyQt6 / PyQt5)
-- Controls ALL playback sinks (PulseAudio/PipeWire via pactl)
+- Controls ALL playback sinks (PulseAudio/PipeWire via libpulse, pactl fallback)
 - Themed OSD panel via Qt Style Sheets (QSS)
 - Themed custom GlossBar via qproperty-* (pyqtProperty)
 - Robust keyboard handling with ALT combos + hardware volume keys
 - GPLv2 JJ Posti <techtimejourney.net>
 """
 
-import sys, threading, subprocess, time, os
-sys.dont_write_bytecode = True
-from evdev import InputDevice, ecodes, categorize, list_devices
+import sys, threading, subprocess, time, os, re, json
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from evdev import InputDevice   # imported lazily at runtime (see find_keyboard_devices)
 
 # ──────────────────────────────── Qt imports (Qt6 → Qt5 fallback) ────────────────────────────────
 USING_QT6 = False
 try:
-    from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QPropertyAnimation, QEasingCurve, QPoint, pyqtProperty
-    from PyQt6.QtGui import QPalette, QColor, QPainter, QBrush, QLinearGradient
-    from PyQt6.QtWidgets import QApplication, QStyleFactory, QWidget, QVBoxLayout, QLabel, QGraphicsDropShadowEffect
+    from PyQt6.QtCore import (Qt, QTimer, QThread, QSocketNotifier, pyqtSignal, pyqtSlot, QObject,
+                              QPropertyAnimation, QEasingCurve, QPoint, QRectF, pyqtProperty)
+    from PyQt6.QtGui import QPalette, QColor, QPainter, QPainterPath, QBrush, QPen, QLinearGradient, QImage, QPixmap
+    from PyQt6.QtWidgets import (QApplication, QStyleFactory, QWidget, QVBoxLayout, QLabel,
+                                 QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect)
     USING_QT6 = True
     print("Using PyQt6")
 except Exception as e:
     print("PyQt6 import failed, falling back to PyQt5:", e)
-    from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QPropertyAnimation, QEasingCurve, QPoint, pyqtProperty
-    from PyQt5.QtGui import QPalette, QColor, QPainter, QBrush, QLinearGradient
-    from PyQt5.QtWidgets import QApplication, QStyleFactory, QWidget, QVBoxLayout, QLabel, QDesktopWidget, QGraphicsDropShadowEffect
+    from PyQt5.QtCore import (Qt, QTimer, QThread, QSocketNotifier, pyqtSignal, pyqtSlot, QObject,
+                              QPropertyAnimation, QEasingCurve, QPoint, QRectF, pyqtProperty)
+    from PyQt5.QtGui import QPalette, QColor, QPainter, QPainterPath, QBrush, QPen, QLinearGradient, QImage, QPixmap
+    from PyQt5.QtWidgets import (QApplication, QStyleFactory, QWidget, QVBoxLayout, QLabel, QDesktopWidget,
+                                 QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect)
     USING_QT6 = False
     print("Using PyQt5")
 
+# ──────────────────────────────── Audio backend (pulsectl → pactl fallback) ────────────────────────────────
+try:
+    import pulsectl
+    print("Using pulsectl (libpulse)")
+except Exception as e:
+    pulsectl = None
+    print("pulsectl import failed, falling back to pactl:", e)
+
 # ──────────────────────────────── Cross‑Qt helpers ────────────────────────────────
 def wflag(name: str):
     return getattr(Qt.WindowType, name) if USING_QT6 else getattr(Qt, name)
@@ -44,9 +57,21 @@ def pen_style(name: str):
 def easing(name: str):
     return getattr(QEasingCurve.Type, name) if USING_QT6 else getattr(QEasingCurve, name)
 
+def anim_state(name: str):
+    return getattr(QPropertyAnimation.State, name) if USING_QT6 else getattr(QPropertyAnimation, name)
+
+def app_attr(name: str):
+    return getattr(Qt.ApplicationAttribute, name) if USING_QT6 else getattr(Qt, name)
+
+def notifier_read():
+    return QSocketNotifier.Type.Read if USING_QT6 else QSocketNotifier.Read
+
 def aa_hint():
     return QPainter.RenderHint.Antialiasing if USING_QT6 else QPainter.Antialiasing
 
+def argb32_format():
+    return QImage.Format.Format_ARGB32_Premultiplied if USING_QT6 else QImage.Format_ARGB32_Premultiplied
+
 def available_geometry(widget: QWidget):
     """Screen work area for positioning the OSD (Qt6/Qt5 compatible)."""
     if USING_QT6:
@@ -54,6 +79,30 @@ def available_geometry(widget: QWidget):
         return scr.availableGeometry()
     return QDesktopWidget().availableGeometry()
 
+def render_shadow(w: int, h: int, color: QColor, radius: int = 16, blur: int = 42, dy: int = 10) -> QPixmap:
+    """Blurred rounded-rect shadow for a w×h panel, padded by `blur` on every side.
+
+    Rendered once (per theme/size) instead of a QGraphicsDropShadowEffect that
+    re-blurs the panel on every repaint.
+    """
+    pad = blur
+    src = QImage(w + 2 * pad, h + 2 * pad, argb32_format()); src.fill(QColor(0, 0, 0, 0))
+    p = QPainter(src); p.setRenderHint(aa_hint())
+    p.setPen(pen_style('NoPen')); p.setBrush(color)
+    p.drawRoundedRect(QRectF(pad, pad + dy, w, h), radius, radius)
+    p.end()
+
+    # One-shot blur through a throwaway scene
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(src))
+    fx = QGraphicsBlurEffect(); fx.setBlurRadius(blur); item.setGraphicsEffect(fx)
+    scene.addItem(item)
+    out = QImage(src.size(), argb32_format()); out.fill(QColor(0, 0, 0, 0))
+    p = QPainter(out)
+    scene.render(p, QRectF(0, 0, out.width(), out.height()), QRectF(0, 0, src.width(), src.height()))
+    p.end()
+    return QPixmap.fromImage(out)
+
 # ──────────────────────────────── THEMES (QSS + shadow colors) ────────────────────────────────
 THEMES = {
     # Sleek dark theme (default)
@@ -171,76 +220,372 @@ THEMES = {
 
 DEFAULT_THEME = "dark"
 
-# ──────────────────────────────── Audio helpers (pactl) ────────────────────────────────
-def _check_output(cmd: list[str]) -> str:
-    return subprocess.check_output(cmd, text=True)
+# ──────────────────────────────── Audio helpers (libpulse / pactl) ────────────────────────────────
+_pulse = None                     # long-lived libpulse connection (None = not connected)
+_pulse_lock = threading.Lock()    # one request at a time on the shared connection
+_pulse_retry_at = 0.0             # monotonic time before which no reconnect is attempted
+PULSE_RETRY = 5.0
+_state_cache = None               # ([vol%...], [mute-bool...], overall, all_muted) kept in sync by watch_sinks()
+_sink_infos = None                # pulsectl sink objects from the last event refresh (reused for writes)
+
+# pactl fallback: sink IDs (and the volumes parsed alongside them) are reused for a short while;
+# while 'pactl subscribe' runs, the IDs stay valid until a sink is added or removed.
+SINKS_TTL = 2.0
+_sinks_watched = False
+_sinks_cache = {"ts": 0.0, "ids": [], "vols": None, "mutes": None, "default_ts": 0.0, "default": None}
+_sinks_lock = threading.Lock()
+
+def _get_pulse():
+    """Return the shared pulsectl connection, or None to use pactl."""
+    global _pulse, _pulse_retry_at
+    if pulsectl is None:
+        return None
+    if _pulse is None and time.monotonic() >= _pulse_retry_at:
+        with _pulse_lock:            # UI and audio worker threads may race to connect
+            if _pulse is None:
+                try:
+                    _pulse = pulsectl.Pulse("dark-osd")
+                except Exception as e:
+                    print(f"[WARN] libpulse connection failed, using pactl: {e}")
+                    _pulse_retry_at = time.monotonic() + PULSE_RETRY
+    return _pulse
+
+def _pulse_failed(what: str, e: Exception):
+    """Report a failed libpulse request; a dead connection is dropped so the next call reconnects."""
+    global _pulse
+    print(f"[WARN] libpulse {what} failed, using pactl: {e}")
+    if isinstance(e, pulsectl.PulseDisconnected):
+        with _pulse_lock:
+            if _pulse is not None:
+                try:
+                    _pulse.close()
+                except Exception:
+                    pass
+                _pulse = None
+
+def _sink_state(sinks) -> tuple[list[int], list[bool]]:
+    """pulsectl sink objects → ([vol%...], [mute-bool...])."""
+    vols = [max(0, min(100, int(round(s.volume.value_flat * 100)))) for s in sinks]
+    return vols, [bool(s.mute) for s in sinks]
+
+def _summarize(vols: list[int], mutes: list[bool]) -> tuple[int, bool]:
+    """Per-sink state → (overall_volume, all_muted)."""
+    overall = int(round(sum(vols) / len(vols))) if vols else 0
+    return overall, (all(mutes) if mutes else False)
+
+def _cache_state(vols: list[int], mutes: list[bool]) -> tuple:
+    """Store per-sink state with its reduction precomputed, as one atomic rebind; returns it."""
+    global _state_cache
+    state = _state_cache = (vols, mutes, *_summarize(vols, mutes))
+    return state
+
+def watch_sinks(on_change=None):
+    """Background thread: mirror sink volume/mute into the state cache on every sink event.
+
+    `on_change(overall, all_muted)` is called after each refresh (from this thread).
+    """
+    global _state_cache, _sink_infos
+    if pulsectl is None:
+        _watch_sinks_pactl()
+        return
+
+    def _stop(_ev):
+        raise pulsectl.PulseLoopStop
+
+    while True:
+        try:
+            # Separate connection: a listening Pulse object can't serve other requests.
+            with pulsectl.Pulse("dark-osd-events") as pulse:
+                pulse.event_mask_set("sink")
+                pulse.event_callback_set(_stop)
+                while True:
+                    _sink_infos = pulse.sink_list()
+                    # Use the tuple just built: the audio worker may rebind _state_cache meanwhile
+                    state = _cache_state(*_sink_state(_sink_infos))
+                    if on_change is not None:
+                        on_change(state[2], state[3])
+                    pulse.event_listen()
+        except Exception as e:
+            print(f"[WARN] Sink event listener lost, reconnecting in {PULSE_RETRY:.0f}s: {e}")
+        _state_cache = _sink_infos = None   # stale until reconnected: callers query directly meanwhile
+        time.sleep(PULSE_RETRY)
+
+# pactl localizes its output ("Mute: yes", "Sink #"): the parsers below expect the C locale.
+_PACTL_ENV = {**os.environ, "LC_ALL": "C"}
+
+def _check_output(cmd: list[str]) -> bytes:
+    # Buffered pipe, raw bytes: the parsers below match on bytes, so nothing is decoded.
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=-1,
+                          check=True, env=_PACTL_ENV).stdout
+
+def _invalidate_sinks():
+    with _sinks_lock:
+        _sinks_cache.update(ts=0.0, ids=[], vols=None, mutes=None, default_ts=0.0, default=None)
+
+def _cached_sinks(need_state: bool = False):
+    """Return the pactl sink cache if still valid (and holding state if asked), else None."""
+    with _sinks_lock:
+        ts = _sinks_cache["ts"]
+        fresh = time.monotonic() - ts < SINKS_TTL
+        if need_state:
+            if not fresh or _sinks_cache["vols"] is None:
+                return None
+        elif not fresh and not (_sinks_watched and ts):
+            return None
+        return dict(_sinks_cache)
+
+def _watch_sinks_pactl():
+    """pactl fallback for watch_sinks(): drop the cached sink list whenever a sink comes or goes."""
+    global _sinks_watched
+    while True:
+        try:
+            proc = subprocess.Popen(["pactl", "subscribe"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    env=_PACTL_ENV)
+        except Exception as e:
+            print(f"[WARN] pactl subscribe unavailable, sink list refreshes every {SINKS_TTL:.0f}s: {e}")
+            return
+        _sinks_watched = True
+        for line in proc.stdout:     # e.g. b"Event 'new' on sink #52"
+            if b" on sink #" in line and (b"'new'" in line or b"'remove'" in line):
+                _invalidate_sinks()
+        proc.wait()
+        _sinks_watched = False
+        _invalidate_sinks()
+        time.sleep(PULSE_RETRY)
+
+def _pactl_batch(commands: list[list[str]]) -> bool:
+    """Run several pactl commands at once and reap them together; True if all succeeded.
+
+    pactl has no multi-command stdin mode (and pacmd is gone under PipeWire), so the
+    per-sink commands are started back-to-back instead of waiting on each in turn.
+    """
+    procs, ok = [], True
+    for args in commands:
+        try:
+            procs.append(subprocess.Popen(["pactl", *args], stdout=subprocess.DEVNULL, env=_PACTL_ENV))
+        except Exception:
+            ok = False
+            break
+    for proc in procs:
+        ok &= proc.wait() == 0
+    return ok
 
 def list_playback_sinks() -> list[str]:
-    """Return sink IDs (strings). Empty if pactl not available."""
+    """Return sink IDs (strings), cached for SINKS_TTL seconds. Empty if pactl not available."""
+    cached = _cached_sinks()
+    if cached is not None:
+        return cached["ids"]
     try:
         out = _check_output(["pactl", "list", "sinks", "short"])
     except Exception:
+        _invalidate_sinks()
         return []
-    sinks = []
-    for line in out.splitlines():
-        parts = line.split('\t')
-        if parts and parts[0].strip().isdigit():
-            sinks.append(parts[0].strip())
+    sinks = [m[1].decode() for m in _SHORT_ID_RE.finditer(out)]
+    with _sinks_lock:
+        _sinks_cache.update(ts=time.monotonic(), ids=sinks, vols=None, mutes=None)
     return sinks
 
-def get_all_volumes_and_mutes():
-    """Parse 'pactl list sinks' → ([vol%...], [mute-bool...])."""
+# 'pactl list sinks [short]' parsers (compiled once, run over the raw bytes)
+_SHORT_ID_RE = re.compile(rb"^\s*(\d+)\t", re.M)
+_SINK_BLOCK_RE = re.compile(rb"^Sink #(\d+)\s*$(.*?)(?=^Sink #|\Z)", re.M | re.S)
+_SINK_VOL_RE = re.compile(rb"^\s*Volume:[^\n]*?(\d+)%", re.M)
+_SINK_MUTE_RE = re.compile(rb"^\s*Mute:\s*(yes|no)", re.M)
+
+_PCT_RE = re.compile(rb"(\d+)%")
+_YESNO_RE = re.compile(rb"\b(yes|no)\b")
+
+_pactl_get_sink = True  # pactl >= 15 has get-sink-*; None while in doubt, False once known missing
+
+def _pactl_default_state():
+    """(volume, muted) of @DEFAULT_SINK@ from two one-line pactl queries; None if unsupported."""
+    global _pactl_get_sink
+    if _pactl_get_sink is False:
+        return None
+    with _sinks_lock:
+        if _sinks_cache["default"] is not None and time.monotonic() - _sinks_cache["default_ts"] < SINKS_TTL:
+            return _sinks_cache["default"]
     try:
-        out = _check_output(["pactl", "list", "sinks"])
+        procs = [subprocess.Popen(["pactl", cmd, "@DEFAULT_SINK@"], stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, env=_PACTL_ENV)
+                 for cmd in ("get-sink-volume", "get-sink-mute")]
+        vol_out, mute_out = (proc.communicate()[0] for proc in procs)
     except Exception:
-        return [], []
-    volumes, mutes = [], []
-    cur_vol, cur_mute = None, None
-    for line in out.splitlines():
-        ls = line.strip()
-        if ls.startswith("Sink #"):
-            if cur_vol is not None:
-                volumes.append(cur_vol)
-                mutes.append(cur_mute if cur_mute is not None else False)
-            cur_vol, cur_mute = None, None
-        elif ls.startswith("Volume:"):
-            for token in ls.replace(',', ' ').split():
-                if token.endswith('%'):
-                    try:
-                        cur_vol = max(0, min(100, int(token[:-1])))
-                        break
-                    except ValueError:
-                        pass
-        elif ls.startswith("Mute:"):
-            cur_mute = ("yes" in ls.lower())
-    if cur_vol is not None:
-        volumes.append(cur_vol)
-        mutes.append(cur_mute if cur_mute is not None else False)
+        return None
+    vol_m, mute_m = _PCT_RE.search(vol_out), _YESNO_RE.search(mute_out)
+    if any(proc.returncode for proc in procs) or not (vol_m and mute_m):
+        # pactl < 15 has no get-sink-*, unparsable output, or the server isn't up yet:
+        # get_state() tells them apart
+        _pactl_get_sink = None
+        return None
+    _pactl_get_sink = True
+    state = (max(0, min(100, int(vol_m[1]))), mute_m[1] == b"yes")
+    with _sinks_lock:
+        _sinks_cache.update(default_ts=time.monotonic(), default=state)
+    return state
+
+def _parse_sink_dump(buf: bytes) -> tuple[list[str], list[int], list[bool]]:
+    """'pactl list sinks' output → ([sink-id...], [vol%...], [mute-bool...]); sinks without a volume are skipped."""
+    ids, volumes, mutes = [], [], []
+    for block in _SINK_BLOCK_RE.finditer(buf):
+        vol_m = _SINK_VOL_RE.search(block[2])
+        if vol_m is None:
+            continue
+        mute_m = _SINK_MUTE_RE.search(block[2])
+        ids.append(block[1].decode())
+        volumes.append(max(0, min(100, int(vol_m[1]))))
+        mutes.append(mute_m is not None and mute_m[1] == b"yes")
+    return ids, volumes, mutes
+
+def _parse_sink_json(buf: bytes) -> tuple[list[str], list[int], list[bool]]:
+    """'pactl --format=json list sinks' output → same lists as _parse_sink_dump()."""
+    ids, volumes, mutes = [], [], []
+    for sink in json.loads(buf):
+        chans = list((sink.get("volume") or {}).values())
+        if not chans:
+            continue
+        try:
+            pct = int(str(chans[0].get("value_percent", "")).rstrip("%"))
+        except ValueError:
+            continue
+        ids.append(str(sink["index"]))
+        volumes.append(max(0, min(100, pct)))
+        mutes.append(bool(sink.get("mute")))
+    return ids, volumes, mutes
+
+_pactl_json = True      # pactl >= 16 has --format=json; cleared once it fails while the text dump works
+
+def _pactl_volumes_and_mutes():
+    """Parse 'pactl list sinks' → ([vol%...], [mute-bool...]); also refreshes the sink-ID cache."""
+    global _pactl_json
+    cached = _cached_sinks(need_state=True)
+    if cached is not None:
+        return cached["vols"], cached["mutes"]
+    parsed = None
+    json_failed = False
+    if _pactl_json:
+        try:
+            parsed = _parse_sink_json(_check_output(["pactl", "--format=json", "list", "sinks"]))
+        except ValueError:
+            _pactl_json = False     # not JSON at all: old pactl, use the text dump from now on
+        except Exception:
+            json_failed = True      # unknown option, or the server isn't up yet
+    if parsed is None:
+        try:
+            parsed = _parse_sink_dump(_check_output(["pactl", "list", "sinks"]))
+        except Exception:
+            _invalidate_sinks()
+            return [], []
+        if json_failed:
+            _pactl_json = False     # the text dump works, so --format=json is what's missing
+    ids, volumes, mutes = parsed
+    with _sinks_lock:
+        _sinks_cache.update(ts=time.monotonic(), ids=ids, vols=volumes, mutes=mutes)
     return volumes, mutes
 
+def get_all_volumes_and_mutes():
+    """Return ([vol%...], [mute-bool...]) for every sink; served from cache while watched."""
+    cached = _state_cache
+    if cached is not None:
+        return cached[0], cached[1]
+    pulse = _get_pulse()
+    if pulse is not None:
+        try:
+            with _pulse_lock:
+                return _sink_state(pulse.sink_list())
+        except Exception as e:
+            _pulse_failed("query", e)
+    return _pactl_volumes_and_mutes()
+
 def get_state():
-    """Return (overall_volume:int 0..100, all_muted:bool)."""
-    vols, mutes = get_all_volumes_and_mutes()
-    overall = int(round(sum(vols) / len(vols))) if vols else 0
-    return overall, (all(mutes) if mutes else False)
+    """Return (overall_volume:int 0..100, all_muted:bool); pactl reports the default sink only."""
+    cached = _state_cache
+    if cached is not None:
+        return cached[2], cached[3]
+    global _pactl_get_sink
+    if _get_pulse() is None:
+        state = _pactl_default_state()
+        if state is not None:
+            return state
+        vols, mutes = get_all_volumes_and_mutes()
+        if vols and _pactl_get_sink is None:
+            _pactl_get_sink = False     # the full dump works, so get-sink-* is what's missing
+        return _summarize(vols, mutes)
+    return _summarize(*get_all_volumes_and_mutes())
 
 def set_volume_all(volume: int):
     """Clamp 0..100 and apply to every sink."""
     v = max(0, min(100, int(volume)))
-    for sink in list_playback_sinks():
-        subprocess.run(["pactl", "set-sink-volume", sink, f"{v}%"], check=False)
+    pulse = _get_pulse()
+    if pulse is not None:
+        try:
+            with _pulse_lock:
+                # Watched sink objects save the sink_list() round-trip; sinks already at the
+                # target are skipped, so only real changes are sent.
+                infos = _sink_infos or pulse.sink_list()
+                for sink in infos:
+                    if any(abs(c - v / 100.0) > 0.004 for c in sink.volume.values):
+                        pulse.volume_set_all_chans(sink, v / 100.0)
+            if _state_cache is not None:
+                # Optimistic update; the sink event that follows confirms it.
+                _cache_state([v] * len(infos), [bool(s.mute) for s in infos])
+            return
+        except Exception as e:
+            _pulse_failed("set-volume", e)
+    if not _pactl_batch([["set-sink-volume", sink, f"{v}%"] for sink in list_playback_sinks()]):
+        _invalidate_sinks()
+        return
+    with _sinks_lock:
+        if _sinks_cache["vols"] is not None:
+            _sinks_cache["vols"] = [v] * len(_sinks_cache["vols"])
+        if _sinks_cache["default"] is not None:
+            _sinks_cache["default"] = (v, _sinks_cache["default"][1])
 
 def change_volume_all(delta: int) -> int:
     """Relative change across all sinks → returns new overall volume."""
     cur, _ = get_state()
     new_v = max(0, min(100, cur + int(delta)))
-    set_volume_all(new_v)
+    set_volume_all(new_v)   # pactl: sink IDs come from the short-lived cache
     return new_v
 
 def toggle_mute_all():
     """Toggle mute on every sink."""
-    for sink in list_playback_sinks():
-        subprocess.run(["pactl", "set-sink-mute", sink, "toggle"], check=False)
+    pulse = _get_pulse()
+    if pulse is not None:
+        try:
+            with _pulse_lock:
+                sinks = _sink_infos or pulse.sink_list()
+                vols, mutes = _sink_state(sinks)
+                mutes = [not m for m in mutes]
+                for sink, m in zip(sinks, mutes):
+                    pulse.mute(sink, m)
+            if _state_cache is not None:
+                _cache_state(vols, mutes)
+            return
+        except Exception as e:
+            _pulse_failed("mute", e)
+    if not _pactl_batch([["set-sink-mute", sink, "toggle"] for sink in list_playback_sinks()]):
+        _invalidate_sinks()
+        return
+    with _sinks_lock:
+        if _sinks_cache["mutes"] is not None:
+            _sinks_cache["mutes"] = [not m for m in _sinks_cache["mutes"]]
+        if _sinks_cache["default"] is not None:
+            _sinks_cache["default"] = (_sinks_cache["default"][0], not _sinks_cache["default"][1])
+
+# ──────────────────────────────── Audio worker (keeps pactl/libpulse off the UI thread) ────────────────────────────────
+class AudioWorker(QObject):
+    """Runs the blocking audio helpers on its own QThread and reports the resulting state."""
+    stateChanged = pyqtSignal(int, bool, bool)     # volume, muted, finished request was a mute toggle
+
+    @pyqtSlot(int)
+    def do_change(self, delta: int):
+        change_volume_all(delta)
+        self.stateChanged.emit(*get_state(), False)
+
+    @pyqtSlot()
+    def do_mute(self):
+        toggle_mute_all()
+        self.stateChanged.emit(*get_state(), True)
 
 # ──────────────────────────────── UI: themeable GlossBar (via pyqtProperty) ────────────────────────────────
 class GlossBar(QWidget):
@@ -270,84 +615,134 @@ class GlossBar(QWidget):
         self._glossEnd   = QColor(255, 255, 255, 0)
         self._radius     = 14
         self.setMinimumHeight(28)
+        self._rebuild_paths()
+        self._rebuild_brushes()
 
     # ---- properties for QSS (qproperty-*) ----
     def _getFrameStart(self): return self._frameStart
-    def _setFrameStart(self, c): self._frameStart = QColor(c); self.update()
+    def _setFrameStart(self, c): self._frameStart = QColor(c); self._rebuild_brushes()
     frameStart = pyqtProperty(QColor, fget=_getFrameStart, fset=_setFrameStart)
 
     def _getFrameMid(self): return self._frameMid
-    def _setFrameMid(self, c): self._frameMid = QColor(c); self.update()
+    def _setFrameMid(self, c): self._frameMid = QColor(c); self._rebuild_brushes()
     frameMid = pyqtProperty(QColor, fget=_getFrameMid, fset=_setFrameMid)
 
     def _getFrameEnd(self): return self._frameEnd
-    def _setFrameEnd(self, c): self._frameEnd = QColor(c); self.update()
+    def _setFrameEnd(self, c): self._frameEnd = QColor(c); self._rebuild_brushes()
     frameEnd = pyqtProperty(QColor, fget=_getFrameEnd, fset=_setFrameEnd)
 
     def _getOutline(self): return self._outline
-    def _setOutline(self, c): self._outline = QColor(c); self.update()
+    def _setOutline(self, c): self._outline = QColor(c); self._rebuild_brushes()
     outline = pyqtProperty(QColor, fget=_getOutline, fset=_setOutline)
 
     def _getFill(self): return self._fill
-    def _setFill(self, c): self._fill = QColor(c); self.update()
+    def _setFill(self, c): self._fill = QColor(c); self._rebuild_brushes()
     fill = pyqtProperty(QColor, fget=_getFill, fset=_setFill)
 
     def _getGlossStart(self): return self._glossStart
-    def _setGlossStart(self, c): self._glossStart = QColor(c); self.update()
+    def _setGlossStart(self, c): self._glossStart = QColor(c); self._rebuild_brushes()
     glossStart = pyqtProperty(QColor, fget=_getGlossStart, fset=_setGlossStart)
 
     def _getGlossEnd(self): return self._glossEnd
-    def _setGlossEnd(self, c): self._glossEnd = QColor(c); self.update()
+    def _setGlossEnd(self, c): self._glossEnd = QColor(c); self._rebuild_brushes()
     glossEnd = pyqtProperty(QColor, fget=_getGlossEnd, fset=_setGlossEnd)
 
     def _getRadius(self): return self._radius
-    def _setRadius(self, v): self._radius = int(v); self.update()
+    def _setRadius(self, v): self._radius = int(v); self._rebuild_paths(); self.update()
     radius = pyqtProperty(int, fget=_getRadius, fset=_setRadius)
 
+    # ---- cached paint objects (rebuilt on color/size change, not per paint) ----
+    def _rebuild_brushes(self):
+        h = self.height()
+        bg = QLinearGradient(0, 0, 0, h)
+        bg.setColorAt(0.0, self._frameStart)
+        bg.setColorAt(0.5, self._frameMid)
+        bg.setColorAt(1.0, self._frameEnd)
+        self._frameBrush = QBrush(bg)
+        self._outlinePen = QPen(self._outline)
+        self._fillBrush  = QBrush(self._fill)
+
+        hi = self.rect().adjusted(4, 4, -4, -max(6, h // 2))
+        gloss = QLinearGradient(0, hi.top(), 0, hi.bottom())
+        gloss.setColorAt(0.0, self._glossStart); gloss.setColorAt(1.0, self._glossEnd)
+        self._glossBrush = QBrush(gloss)
+        self.update()
+
+    def _rebuild_paths(self):
+        """Outer frame + gloss shapes depend on size/radius only; the fill also on the value."""
+        r = self.rect(); rad = self._radius
+        self._outerPath = QPainterPath()
+        self._outerPath.addRoundedRect(QRectF(r), rad, rad)
+        hi = r.adjusted(4, 4, -4, -max(6, r.height() // 2))
+        self._glossPath = QPainterPath()
+        self._glossPath.addRoundedRect(QRectF(hi), max(0, rad - 4), max(0, rad - 4))
+        self._rebuild_fill_path()
+
+    def _rebuild_fill_path(self):
+        r = self.rect(); rad = self._radius
+        fill_w = int(r.width() * (self._value / 100.0))
+        self._fillPath = None
+        if fill_w > 0:
+            fill = r.adjusted(2, 2, -2, -2); fill.setWidth(max(0, fill_w - 4))
+            self._fillPath = QPainterPath()
+            self._fillPath.addRoundedRect(QRectF(fill), max(0, rad - 2), max(0, rad - 2))
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._rebuild_paths()
+        self._rebuild_brushes()
+
     # ---- API ----
     def setValue(self, val: int):
-        self._value = max(0, min(100, int(val)))
+        v = max(0, min(100, int(val)))
+        if v == self._value:
+            return
+        self._value = v
+        self._rebuild_fill_path()
         self.update()
 
     def paintEvent(self, _):
         p = QPainter(self); p.setRenderHint(aa_hint())
-        r = self.rect(); rad = self._radius
 
         # Outer frame
-        bg = QLinearGradient(0, 0, 0, r.height())
-        bg.setColorAt(0.0, self._frameStart)
-        bg.setColorAt(0.5, self._frameMid)
-        bg.setColorAt(1.0, self._frameEnd)
-        p.setBrush(QBrush(bg)); p.setPen(self._outline)
-        p.drawRoundedRect(r, rad, rad)
+        p.setBrush(self._frameBrush); p.setPen(self._outlinePen)
+        p.drawPath(self._outerPath)
 
         # Fill
-        fill_w = int(r.width() * (self._value / 100.0))
-        if fill_w > 0:
-            fill = r.adjusted(2, 2, -2, -2); fill.setWidth(max(0, fill_w - 4))
-            p.setBrush(self._fill); p.setPen(pen_style('NoPen'))
-            p.drawRoundedRect(fill, max(0, rad - 2), max(0, rad - 2))
+        p.setPen(pen_style('NoPen'))
+        if self._fillPath is not None:
+            p.setBrush(self._fillBrush)
+            p.drawPath(self._fillPath)
 
         # Gloss highlight
-        hi = r.adjusted(4, 4, -4, -max(6, r.height() // 2))
-        gloss = QLinearGradient(0, hi.top(), 0, hi.bottom())
-        gloss.setColorAt(0.0, self._glossStart); gloss.setColorAt(1.0, self._glossEnd)
-        p.setBrush(QBrush(gloss)); p.setPen(pen_style('NoPen'))
-        p.drawRoundedRect(hi, max(0, rad - 4), max(0, rad - 4))
+        p.setBrush(self._glossBrush)
+        p.drawPath(self._glossPath)
 
 # ──────────────────────────────── UI: OSD widget ────────────────────────────────
 class VolumeOSD(QWidget):
     """On‑screen display that mirrors system volume state and animates in/out."""
+    changeRequested = pyqtSignal(int)    # → AudioWorker.do_change (queued to the audio thread)
+    muteRequested   = pyqtSignal()       # → AudioWorker.do_mute
+
     def __init__(self, step: int = 5, theme: str = DEFAULT_THEME):
         super().__init__()
         self.step = int(step)
         self._slide = QPropertyAnimation(self, b"pos")
         self._visible_target = self._hidden_target = QPoint(0, 0)
+        self._geo_dirty = True           # targets must be recomputed (screen or size changed)
+        self._volume = 0                 # last known system volume (for optimistic display)
+        self._pending_delta = 0          # key presses not yet written to the sinks
+        self._last = (None, None)        # (volume, muted) currently on screen
+        self._in_flight = 0              # requests handed to the audio worker, not yet reported
+        self._current_theme = None       # key of the applied theme (QSS is only re-applied on change)
 
         self._build_ui()
         self.apply_theme(theme)          # apply a theme here
         self._setup_anim()
+        self._setup_geometry()
         self._setup_autohide()
+        self._setup_commit()
+        self._setup_worker()
         self.refresh_from_system()
 
     # --- UI setup ---
@@ -359,6 +754,9 @@ class VolumeOSD(QWidget):
             wflag('Tool')
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        # We paint everything ourselves (shadow + panel): skip the native background fill
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
         self.resize(380, 130)
 
         # The inner 'panel' gets the themed background & border.
@@ -373,10 +771,11 @@ class VolumeOSD(QWidget):
 
         lay.addWidget(self.label); lay.addWidget(self.bar)
 
-        # Shadow around the panel (color adjusted per theme)
-        self._shadow = QGraphicsDropShadowEffect(self.panel)
-        self._shadow.setBlurRadius(42); self._shadow.setXOffset(0); self._shadow.setYOffset(10)
-        self.panel.setGraphicsEffect(self._shadow)
+        # Shadow around the panel: pre-rendered pixmap (color per theme), painted in paintEvent
+        self._shadow_pix = None
+        self._shadow_size = None         # widget size the pixmap was rendered for
+        self._shadow_pad = 42
+        self._shadow_color = None
 
         # Fit panel to top-level widget rect
         outer = QVBoxLayout(self); outer.setContentsMargins(0, 0, 0, 0); outer.addWidget(self.panel)
@@ -386,15 +785,63 @@ class VolumeOSD(QWidget):
         self._slide.setEasingCurve(easing('OutCubic'))
         self._slide.finished.connect(self._on_slide_finished)
 
+    def _setup_geometry(self):
+        # Screen work area is cached; refreshed only when the screen setup changes.
+        self._geo = available_geometry(self)
+        self._screen_hooked = False
+        scr = QApplication.primaryScreen()
+        if scr is not None:
+            scr.availableGeometryChanged.connect(self._refresh_geo)
+        app = QApplication.instance()
+        app.screenAdded.connect(self._refresh_geo)
+        app.screenRemoved.connect(self._refresh_geo)
+        app.primaryScreenChanged.connect(self._refresh_geo)
+
+    def _refresh_geo(self, *_):
+        self._geo = available_geometry(self)
+        self._geo_dirty = True
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        # The native window only exists once shown; follow it across screens from then on.
+        if not self._screen_hooked and self.windowHandle() is not None:
+            self.windowHandle().screenChanged.connect(self._refresh_geo)
+            self._screen_hooked = True
+
     def _setup_autohide(self):
         self._hide_timer = QTimer(self); self._hide_timer.setSingleShot(True)
         self._hide_timer.setInterval(1600); self._hide_timer.timeout.connect(self.slide_out)
 
+    def _setup_commit(self):
+        # Coalesce key repeat: at most one volume write per 30 ms, carrying the summed delta.
+        self._commit_timer = QTimer(self); self._commit_timer.setSingleShot(True)
+        self._commit_timer.setInterval(30); self._commit_timer.timeout.connect(self._flush)
+
+    def _setup_worker(self):
+        self._audio_thread = QThread(self)
+        self._worker = AudioWorker()
+        self._worker.moveToThread(self._audio_thread)
+        self.changeRequested.connect(self._worker.do_change)
+        self.muteRequested.connect(self._worker.do_mute)
+        self._worker.stateChanged.connect(self._on_audio_state)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_worker)
+        self._audio_thread.start()
+
+    def _stop_worker(self):
+        self._audio_thread.quit(); self._audio_thread.wait()
+
     # --- Theme application ---
     def apply_theme(self, name: str):
         """Apply a theme by name: dark | blue | grey | wood."""
         key = (name or "").lower()
-        theme = THEMES.get(key, THEMES[DEFAULT_THEME])
+        if key not in THEMES:
+            key = DEFAULT_THEME
+        if key == self._current_theme:
+            return      # setStyleSheet re-polishes every widget; skip when nothing changes
+        self._current_theme = key
+        theme = THEMES[key]
 
         # Apply QSS at the application level so all widgets (including custom ones) receive it.
         app = QApplication.instance()
@@ -405,12 +852,36 @@ class VolumeOSD(QWidget):
             self.setStyleSheet(theme["qss"])
 
         # Shadow color (not style-able via QSS)
-        self._shadow.setColor(theme.get("shadow", QColor(0, 0, 0, 200)))
+        self._shadow_color = theme.get("shadow", QColor(0, 0, 0, 200))
+        self._rebuild_shadow()
         print(f"[THEME] QSS applied for '{key}'")
 
+    def _rebuild_shadow(self):
+        """Blur once per theme/size; paintEvent only blits the result."""
+        if self._shadow_color is None:
+            return
+        self._shadow_pix = render_shadow(self.width(), self.height(), self._shadow_color, blur=self._shadow_pad)
+        self._shadow_size = self.size()
+        self.update()
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        if e.size() != e.oldSize():
+            self._geo_dirty = True
+        if e.size() != self._shadow_size:
+            self._rebuild_shadow()     # first show reports an invalid old size: don't blur twice
+
+    def paintEvent(self, _):
+        if self._shadow_pix is not None:
+            p = QPainter(self)
+            p.drawPixmap(-self._shadow_pad, -self._shadow_pad, self._shadow_pix)
+
     # --- Positioning/animation ---
     def _compute_targets(self):
-        geo = available_geometry(self)
+        if not self._geo_dirty:
+            return
+        self._geo_dirty = False
+        geo = self._geo
         x = (geo.width() - self.width()) // 2 + geo.x()
         y_visible = int(geo.height() * 0.82 - self.height() // 2) + geo.y()
         y_hidden = y_visible + 40
@@ -423,12 +894,21 @@ class VolumeOSD(QWidget):
 
     def slide_in(self):
         self._compute_targets()
+        running = self._slide.state() == anim_state('Running')
+        if running and self._slide.endValue() == self._visible_target:
+            return      # already sliding in (key repeat): let the running animation finish
+        if not running and self.isVisible() and self.pos() == self._visible_target:
+            return      # already shown: the caller only needs to re-arm the hide timer
         if not self.isVisible():
             self.move(self._hidden_target); self.show(); self.raise_()
         self._slide.stop(); self._slide.setStartValue(self.pos()); self._slide.setEndValue(self._visible_target); self._slide.start()
 
     def slide_out(self):
         self._compute_targets()
+        if not self.isVisible():
+            return
+        if self._slide.state() == anim_state('Running') and self._slide.endValue() == self._hidden_target:
+            return
         self._slide.stop(); self._slide.setStartValue(self.pos()); self._slide.setEndValue(self._hidden_target); self._slide.start()
 
     def _show_and_arm_hide(self):
@@ -436,140 +916,220 @@ class VolumeOSD(QWidget):
         self._hide_timer.start()
 
     # --- State sync + actions ---
+    def _display(self, vol: int, muted: bool, show: bool = True):
+        """Repaint only when the shown state changes; with `show`, keep the OSD up."""
+        changed = (vol, muted) != self._last
+        if changed:
+            self._last = (vol, muted)
+            if muted:
+                self.label.setText("Muted"); self.bar.setValue(0)
+            else:
+                self.label.setText(f"Volume: {vol}%"); self.bar.setValue(vol)
+        if not show:
+            return
+        if not changed and self._hide_timer.isActive():
+            self._hide_timer.start()     # already shown with this state: just extend
+            return
+        self._show_and_arm_hide()
+
+    def sync_state(self, vol: int, muted: bool):
+        """Sink event (other mixer, device switch): follow it quietly, without popping up."""
+        if self._in_flight or self._pending_delta:
+            return      # our own request is still settling; its result will follow
+        self._volume = vol
+        self._display(vol, muted, show=False)
+
     def refresh_from_system(self):
         vol, muted = get_state()
-        if muted:
-            self.label.setText("Muted"); self.bar.setValue(0)
-        else:
-            self.label.setText(f"Volume: {vol}%"); self.bar.setValue(vol)
-        self._show_and_arm_hide()
+        self._volume = vol
+        self._display(vol, muted)
+
+    def _queue_change(self, delta: int):
+        """Show the new volume right away; the write happens in _flush()."""
+        self._pending_delta = max(-self._volume, min(100 - self._volume, self._pending_delta + delta))
+        self._display(self._volume + self._pending_delta, False)
+        if not self._commit_timer.isActive():
+            self._commit_timer.start()
+
+    def _flush(self):
+        delta, self._pending_delta = self._pending_delta, 0
+        if delta:
+            self._volume = max(0, min(100, self._volume + delta))   # expected; worker confirms
+            self._in_flight += 1
+            self.changeRequested.emit(delta)
+
+    def _on_audio_state(self, vol: int, muted: bool, from_mute: bool):
+        """Worker finished a request; show the real state once nothing newer is queued.
+
+        Volume keys always show the level (even while muted); only a mute toggle shows "Muted".
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        if self._in_flight or self._pending_delta:
+            return
+        self._volume = vol
+        self._display(vol, muted and from_mute)
 
     def increase_volume(self):
-        v = change_volume_all(self.step)
-        self.label.setText(f"Volume: {v}%"); self.bar.setValue(v)
-        self._show_and_arm_hide()
+        self._queue_change(self.step)
 
     def decrease_volume(self):
-        v = change_volume_all(-self.step)
-        self.label.setText(f"Volume: {v}%"); self.bar.setValue(v)
-        self._show_and_arm_hide()
+        self._queue_change(-self.step)
 
     def toggle_mute(self):
-        toggle_mute_all()
-        self.refresh_from_system()
+        self._commit_timer.stop(); self._flush()
+        self._in_flight += 1
+        self.muteRequested.emit()
 
 # ──────────────────────────────── Signals to cross threads → Qt main thread ────────────────────────────────
 class VolumeSignals(QObject):
-    increase = pyqtSignal()
-    decrease = pyqtSignal()
-    mute     = pyqtSignal()
+    state    = pyqtSignal(int, bool)   # sink watcher → (overall volume, all muted)
 
 # ──────────────────────────────── Modifier & rate limiting ────────────────────────────────
 class ModifierState:
-    """Thread‑safe ALT tracker across devices (press on one, release on another)."""
+    """ALT tracker across devices (press on one, release on another).
+
+    Lock-free: all devices are read on the Qt main thread, and a stray
+    count is clamped by max(0, …) on release anyway.
+    """
     def __init__(self):
-        self._lock = threading.Lock()
         self._alt_count = 0
     def press_alt(self):
-        with self._lock: self._alt_count += 1
+        self._alt_count += 1
     def release_alt(self):
-        with self._lock: self._alt_count = max(0, self._alt_count - 1)
+        self._alt_count = max(0, self._alt_count - 1)
     def is_alt_active(self) -> bool:
-        with self._lock: return self._alt_count > 0
+        return self._alt_count > 0
 
 class RateLimiter:
-    """Limit action emission rate (do NOT limit modifier state changes)."""
-    def __init__(self, incdec=0.08, mute=0.20):
-        self._lock = threading.Lock()
-        self._last = {"inc": 0.0, "dec": 0.0, "mute": 0.0}
-        self._gap  = {"inc": float(incdec), "dec": float(incdec), "mute": float(mute)}
-    def allow(self, kind: str) -> bool:
-        now = time.monotonic()
-        with self._lock:
-            if now - self._last.get(kind, 0.0) >= self._gap[kind]:
-                self._last[kind] = now
-                return True
-            return False
-
-# ──────────────────────────────── Keyboard event loop (evdev) ────────────────────────────────
-def read_keyboard_events(signals: VolumeSignals, dev_path: str, mods: ModifierState, rate: RateLimiter):
-    """Read key events from one device and emit debounced volume actions."""
-    try:
-        dev = InputDevice(dev_path)
-        print(f"[INFO] Listening on {dev_path} ({dev.name})")
-    except Exception as e:
-        print(f"[ERROR] Could not open {dev_path}: {e}")
-        return
+    """Limit action emission rate (do NOT limit modifier state changes).
 
-    KEY_UP, KEY_DOWN, KEY_M = ecodes.KEY_UP, ecodes.KEY_DOWN, ecodes.KEY_M
-    KEY_VOLUMEUP, KEY_VOLUMEDOWN, KEY_MUTE = ecodes.KEY_VOLUMEUP, ecodes.KEY_VOLUMEDOWN, ecodes.KEY_MUTE
+    One method per action, plain attributes, no lock: only the Qt main thread calls these.
+    `now` is the evdev event timestamp (seconds), so no clock is read per key; a
+    timestamp that goes backwards (wall-clock step) is let through.
+    """
+    def __init__(self, incdec=0.08, mute=0.20):
+        self._last_inc = self._last_dec = self._last_mute = 0.0
+        self._gap_inc = self._gap_dec = float(incdec)
+        self._gap_mute = float(mute)
+    def allow_inc(self, now: float) -> bool:
+        if not 0.0 <= now - self._last_inc < self._gap_inc:
+            self._last_inc = now
+            return True
+        return False
+    def allow_dec(self, now: float) -> bool:
+        if not 0.0 <= now - self._last_dec < self._gap_dec:
+            self._last_dec = now
+            return True
+        return False
+    def allow_mute(self, now: float) -> bool:
+        if not 0.0 <= now - self._last_mute < self._gap_mute:
+            self._last_mute = now
+            return True
+        return False
+
+# ──────────────────────────────── Keyboard events (evdev fds on the Qt event loop) ────────────────────────────────
+def listen_keyboards(osd: "VolumeOSD", devices: list["InputDevice"], mods: ModifierState, rate: RateLimiter) -> list:
+    """Watch every device fd with a QSocketNotifier and act on the OSD directly.
+
+    The notifiers are children of the OSD, so they live as long as it does.
+    """
+    from evdev import ecodes
     KEY_LEFTALT, KEY_RIGHTALT = ecodes.KEY_LEFTALT, ecodes.KEY_RIGHTALT
-
-    for event in dev.read_loop():
-        if event.type != ecodes.EV_KEY:
-            continue
-        ke = categorize(event)
-        ks = ke.keystate  # 0=up, 1=down, 2=hold
-        is_press_or_hold = ks in (ke.key_down, getattr(ke, "key_hold", 2))
-
-        # Always update ALT state immediately (never rate limit modifiers)
-        if ke.scancode in (KEY_LEFTALT, KEY_RIGHTALT):
-            if ks == ke.key_down:
-                mods.press_alt()
-            elif ks == ke.key_up:
-                mods.release_alt()
-            continue
-
-        # Hardware volume keys
-        if is_press_or_hold:
-            if ke.scancode == KEY_VOLUMEUP and rate.allow("inc"):
-                signals.increase.emit(); continue
-            if ke.scancode == KEY_VOLUMEDOWN and rate.allow("dec"):
-                signals.decrease.emit(); continue
-            if ke.scancode == KEY_MUTE and rate.allow("mute"):
-                signals.mute.emit(); continue
-
-        # ALT combos (Up/Down/M)
-        if mods.is_alt_active() and is_press_or_hold:
-            if ke.scancode == KEY_UP and rate.allow("inc"):
-                signals.increase.emit()
-            elif ke.scancode == KEY_DOWN and rate.allow("dec"):
-                signals.decrease.emit()
-            elif ke.scancode == KEY_M and rate.allow("mute"):
-                signals.mute.emit()
+    KS_UP, KS_DOWN, KS_HOLD = 0, 1, 2   # event.value for EV_KEY
+    EV_KEY = ecodes.EV_KEY
+
+    # scancode → (rate check, action); one dict lookup instead of an if/elif ladder
+    DISPATCH = {
+        ecodes.KEY_VOLUMEUP:   (rate.allow_inc,  osd.increase_volume),
+        ecodes.KEY_VOLUMEDOWN: (rate.allow_dec,  osd.decrease_volume),
+        ecodes.KEY_MUTE:       (rate.allow_mute, osd.toggle_mute),
+    }
+    ALT_DISPATCH = {             # ALT combos (Up/Down/M)
+        ecodes.KEY_UP:   (rate.allow_inc,  osd.increase_volume),
+        ecodes.KEY_DOWN: (rate.allow_dec,  osd.decrease_volume),
+        ecodes.KEY_M:    (rate.allow_mute, osd.toggle_mute),
+    }
+    # Everything else (normal typing) is dropped before any further work
+    INTERESTING = frozenset((*DISPATCH, *ALT_DISPATCH, KEY_LEFTALT, KEY_RIGHTALT))
+
+    def drain(dev: "InputDevice", notifier: QSocketNotifier):
+        try:
+            # Drain everything the kernel has queued for this device in one read()
+            events = list(dev.read())
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"[WARN] Stopped listening on {dev.path}: {e}")
+            notifier.setEnabled(False)
+            return
+
+        for event in events:
+            if event.type != EV_KEY or event.code not in INTERESTING:
+                continue
+            code, ks = event.code, event.value   # raw fields: no KeyEvent allocation
+            is_press_or_hold = ks == KS_DOWN or ks == KS_HOLD
+
+            # Always update ALT state immediately (never rate limit modifiers)
+            if code == KEY_LEFTALT or code == KEY_RIGHTALT:
+                if ks == KS_DOWN:
+                    mods.press_alt()
+                elif ks == KS_UP:
+                    mods.release_alt()
+                continue
+
+            if not is_press_or_hold:
+                continue
+            now = event.sec + event.usec * 1e-6
+
+            # Hardware volume keys, then ALT combos
+            action = DISPATCH.get(code) or (mods.is_alt_active() and ALT_DISPATCH.get(code))
+            if action:
+                allow, fire = action
+                if allow(now):
+                    fire()
+
+    notifiers = []
+    for dev in devices:
+        n = QSocketNotifier(dev.fd, notifier_read(), osd)
+        n.activated.connect(lambda *_, d=dev, n=n: drain(d, n))
+        notifiers.append(n)
+        print(f"[INFO] Listening on {dev.path} ({dev.name})")
+    return notifiers
 
 # ──────────────────────────────── Device discovery ────────────────────────────────
-def find_keyboard_devices() -> list[str]:
-    """Prefer devices with 'keyboard' in name; fallback to those exposing A..Z."""
-    paths = []
+def find_keyboard_devices() -> list["InputDevice"]:
+    """Prefer devices with 'keyboard' in name; fallback to those exposing A..Z. Each node is opened once."""
+    from evdev import InputDevice, ecodes, list_devices
+    opened = {}
     for p in list_devices():
         try:
-            dev = InputDevice(p)
-            if "keyboard" in (dev.name or "").lower():
-                paths.append(p)
+            opened[p] = InputDevice(p)
         except Exception:
             pass
-    if paths:
-        print("[INFO] Keyboard devices:")
-        for p in paths:
-            try: print(f"   {p}: {InputDevice(p).name}")
-            except Exception: print(f"   {p}")
-        return paths
-
-    fallback = []
-    for p in list_devices():
-        try:
-            caps = InputDevice(p).capabilities().get(ecodes.EV_KEY, [])
+
+    found = [d for d in opened.values() if "keyboard" in (d.name or "").lower()]
+    title = "Keyboard devices:"
+    if not found:
+        title = "Fallback devices (KEY_A..KEY_Z):"
+        for d in opened.values():
+            try:
+                caps = d.capabilities().get(ecodes.EV_KEY, [])
+            except Exception:
+                continue
             if ecodes.KEY_A in caps and ecodes.KEY_Z in caps:
-                fallback.append(p)
-        except Exception:
-            pass
-    if fallback:
-        print("[INFO] Fallback devices (KEY_A..KEY_Z):")
-        for p in fallback:
-            try: print(f"   {p}: {InputDevice(p).name}")
-            except Exception: print(f"   {p}")
-        return fallback
+                found.append(d)
+
+    # Release every node we are not going to listen on
+    keep = {d.path for d in found}
+    for p, d in opened.items():
+        if p not in keep:
+            d.close()
+
+    if found:
+        print(f"[INFO] {title}")
+        for d in found:
+            print(f"   {d.path}: {d.name}")
+        return found
 
     print("[ERROR] No suitable keyboard devices found."); sys.exit(1)
 
@@ -589,6 +1149,8 @@ def apply_dark_palette(app: QApplication):
     app.setPalette(pal)
 
 # ──────────────────────────────── Parse CLI theme ────────────────────────────────
+_THEME_RE = re.compile(r"^[ \t]*theme[ \t]*=[ \t]*(.*?)\s*$", re.M)   # first 'theme=' line; '#' lines never match
+
 def resolve_theme() -> str:
     # 1) CLI flag
     for arg in sys.argv[1:]:
@@ -625,17 +1187,13 @@ def resolve_theme() -> str:
     for path in cfg_candidates:
         try:
             with open(path) as f:
-                for raw in f:
-                    s = raw.strip()
-                    if not s or s.startswith("#"):
-                        continue
-                    if s.startswith("theme="):
-                        t = s.split("=", 1)[1].strip().lower()
-                        if t in THEMES:
-                            print(f"[THEME] Using '{t}' (from {path})")
-                            return t
-                        print(f"[WARN] Theme '{t}' in {path} not recognized. Available: {', '.join(THEMES)}")
-                        break
+                m = _THEME_RE.search(f.read())
+            if m:
+                t = m[1].lower()
+                if t in THEMES:
+                    print(f"[THEME] Using '{t}' (from {path})")
+                    return t
+                print(f"[WARN] Theme '{t}' in {path} not recognized. Available: {', '.join(THEMES)}")
         except FileNotFoundError:
             continue
         except Exception as e:
@@ -647,10 +1205,25 @@ def resolve_theme() -> str:
 
 # ──────────────────────────────── Main ────────────────────────────────
 def main():
-    kb_paths = find_keyboard_devices()
+    # Key handling and repaints share the main (Qt) thread: ask for a slightly higher
+    # priority so other busy processes don't delay it. Needs CAP_SYS_NICE; optional.
+    try:
+        os.nice(-5)
+        print("[INFO] Raised scheduling priority (nice -5)")
+    except OSError:
+        pass
+
+    kb_devs = find_keyboard_devices()
 
+    # Merge bursts of mouse-move/wheel/etc. events; must be set before the app exists
+    QApplication.setAttribute(app_attr('AA_CompressHighFrequencyEvents'), True)
     app = QApplication(sys.argv)
-    app.setStyle(QStyleFactory.create("Fusion"))
+    try:
+        style = QStyleFactory.create("Fusion")
+        if style is not None:
+            app.setStyle(style)
+    except Exception as e:
+        print("[WARN] Fusion style unavailable, using the platform default:", e)
 
     # If you really want a base palette, apply it BEFORE theming and be aware it can affect colors.
     # For strict theming via QSS, keep this disabled:
@@ -660,15 +1233,16 @@ def main():
     osd = VolumeOSD(step=5, theme=theme)
 
     signals = VolumeSignals()
-    signals.increase.connect(osd.increase_volume)
-    signals.decrease.connect(osd.decrease_volume)
-    signals.mute.connect(osd.toggle_mute)
+    signals.state.connect(osd.sync_state)
 
     mods = ModifierState()
     rate = RateLimiter(incdec=0.08, mute=0.20)  # tune repeats here
 
-    for path in kb_paths:
-        threading.Thread(target=read_keyboard_events, args=(signals, path, mods, rate), daemon=True).start()
+    # Keep sink state cached from PulseAudio events (no-op without pulsectl)
+    threading.Thread(target=watch_sinks, args=(signals.state.emit,), daemon=True).start()
+
+    # Keyboards are read on the Qt event loop itself (no input threads)
+    listen_keyboards(osd, kb_devs, mods, rate)
 
     sys.exit(app.exec() if USING_QT6 else app.exec_())
 
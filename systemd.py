@@ -2,6 +2,7 @@
 import sys
 import os
 import subprocess
+from string import Template
 
 def install_systemd_service():
     # Prevent running as root (would install into /root)
@@ -31,26 +32,16 @@ def install_systemd_service():
     # Get current DISPLAY, default to :0
     display_env = os.environ.get("DISPLAY", ":0")
 
-    # Service file content with HOME + XDG_CONFIG_HOME set
-    service_file_content = f"""[Unit]
-Description=Volume OSD Service
-After=graphical-session.target
-
-[Service]
-Type=simple
-# Delay startup to allow the desktop environment to fully initialize
-ExecStartPre=/bin/sleep 5
-ExecStart={sys.executable} {script_path}
-Restart=always
-RestartSec=5
-Environment=DISPLAY={display_env}
-Environment=HOME=%h
-Environment=XDG_RUNTIME_DIR=/run/user/%U
-Environment=XDG_CONFIG_HOME=%h/.config
-
-[Install]
-WantedBy=default.target
-"""
+    # Service file content comes from volume-osd.service.in next to this script;
+    # systemd specifiers (%h, %U) are left for systemd to expand
+    template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "volume-osd.service.in")
+    try:
+        with open(template_path) as f:
+            service_file_content = Template(f.read()).substitute(
+                PYTHON=sys.executable, SCRIPT=script_path, DISPLAY=display_env)
+    except Exception as e:
+        print(f"[ERROR] Could not read service template {template_path}: {e}")
+        sys.exit(1)
 
     # Always overwrite
     try: